@@ -1,4 +1,4 @@
-from typing import Dict, Set, Tuple, List, Optional
+from typing import Dict, Set, Tuple, List, Optional, Hashable, Sequence
 
 import numpy
 
@@ -18,7 +18,8 @@ class Dfa(Fa):
 
     @classmethod
     def nfa_to_dfa(cls, nfa: Nfa) -> 'Dfa':
-        initial_state: Tuple[str, ...] = tuple(Nfa.get_epsilon_closure(nfa=nfa, state=nfa.initial_state))
+        epsilon_closures: Dict[str, Set[str]] = nfa.get_epsilon_closures()
+        initial_state: Tuple[str, ...] = tuple(epsilon_closures[nfa.initial_state])
 
         alphabets: Set[str] = nfa.alphabets.copy()
         alphabets.remove(Symbols.EPSILON)
@@ -51,8 +52,7 @@ class Dfa(Fa):
                         state, {}).get(alphabet, None)
                     if state_alphabet_transactions:
                         for destination_state in state_alphabet_transactions:
-                            new_set_states = new_set_states.union(
-                                Nfa.get_epsilon_closure(nfa=nfa, state=destination_state))
+                            new_set_states.update(epsilon_closures[destination_state])
 
                 new_tuple_states = tuple(new_set_states) if new_set_states else Symbols.TRAP_STATE
                 if new_tuple_states not in states_table:
@@ -81,6 +81,7 @@ class Dfa(Fa):
         final_reachable_states: List[str] = []
 
         stack: List[str] = [self.initial_state]
+        seen_states: Set[str] = {self.initial_state}
         counter: int = 0
         while stack:
             current_state: str = stack.pop()
@@ -93,11 +94,38 @@ class Dfa(Fa):
 
             for alphabet in self.alphabets:
                 destination_state = self.transactions[current_state][alphabet]
-                if destination_state not in reachable_states and destination_state not in stack:
+                if destination_state not in seen_states:
+                    seen_states.add(destination_state)
                     stack.append(destination_state)
 
         return reachable_states, reachable_states_reverse, final_reachable_states
 
+    def trim(self) -> int:
+        useful_states: Set[str] = self.get_useful_states()
+
+        # dead states are merged into a single trap state to keep the dfa complete
+        new_transactions: Dict[str, Dict[str, str]] = {}
+        has_trap_state: bool = False
+        for state in useful_states:
+            new_transactions[state] = {}
+            for alphabet in self.alphabets:
+                destination_state = self.transactions.get(state, {}).get(alphabet)
+                if destination_state not in useful_states:
+                    destination_state = Symbols.TRAP_STATE
+                    has_trap_state = True
+                new_transactions[state][alphabet] = destination_state
+
+        new_states: Set[str] = set(useful_states)
+        if has_trap_state:
+            new_states.add(Symbols.TRAP_STATE)
+            new_transactions[Symbols.TRAP_STATE] = {alphabet: Symbols.TRAP_STATE for alphabet in self.alphabets}
+
+        removed_states_count = len(self.states - new_states)
+        self.states = new_states
+        self.final_states = self.final_states & useful_states
+        self.transactions = new_transactions
+        return removed_states_count
+
     @classmethod
     def minimize_dfa(cls, dfa: 'Dfa') -> 'Dfa':
         dfa_reachable_states: Dict[str, int]
@@ -185,3 +213,63 @@ class Dfa(Fa):
                     dfa.transactions[state[0]][alphabet])
 
         return new_dfa
+
+    @property
+    def transition_table(self) -> Tuple[numpy.ndarray, Dict[Hashable, int], Dict[str, int], numpy.ndarray]:
+        states: List[Hashable] = [self.initial_state] + [
+            state for state in self.transactions.keys() if state != self.initial_state]
+        states_index: Dict[Hashable, int] = {state: index for index, state in enumerate(states)}
+        alphabets_index: Dict[str, int] = {alphabet: index for index, alphabet in enumerate(sorted(self.alphabets))}
+
+        # the last row is a dead state, the two extra columns are for characters that are not in
+        # the alphabets (go to the dead state) and for padding (stay in the current state)
+        dead_state: int = len(states)
+        table = numpy.full((dead_state + 1, len(alphabets_index) + 2), dead_state, dtype=numpy.int32)
+        table[:, -1] = numpy.arange(dead_state + 1)
+        for state, state_transactions in self.transactions.items():
+            for alphabet, destination_state in state_transactions.items():
+                table[states_index[state]][alphabets_index[alphabet]] = states_index.get(destination_state, dead_state)
+
+        is_final = numpy.zeros(dead_state + 1, dtype=bool)
+        for state in self.final_states:
+            if state in states_index:
+                is_final[states_index[state]] = True
+
+        return table, states_index, alphabets_index, is_final
+
+    def match(self, word: str) -> bool:
+        current_state = self.initial_state
+        for character in word:
+            current_state = self.transactions.get(current_state, {}).get(character)
+            if current_state is None:
+                return False
+        return current_state in self.final_states
+
+    def match_batch(self, words: Sequence[str]) -> List[bool]:
+        return self.match_batch_with_table(self.transition_table, words=words)
+
+    @staticmethod
+    def match_batch_with_table(
+        transition_table: Tuple[numpy.ndarray, Dict[Hashable, int], Dict[str, int], numpy.ndarray],
+        words: Sequence[str]
+    ) -> List[bool]:
+        table, _, alphabets_index, is_final = transition_table
+        if not words:
+            return []
+
+        unknown_alphabet: int = len(alphabets_index)
+        max_length: int = max(len(word) for word in words)
+
+        # words are right aligned, so the left padding keeps every word in the initial state
+        padding_alphabet: int = unknown_alphabet + 1
+        characters = numpy.full((len(words), max_length), padding_alphabet, dtype=numpy.int32)
+        for row, word in enumerate(words):
+            if word:
+                characters[row, max_length - len(word):] = [
+                    alphabets_index.get(character, unknown_alphabet) for character in word]
+
+        current_states = numpy.zeros(len(words), dtype=numpy.int32)
+        for col in range(max_length):
+            current_states = table[current_states, characters[:, col]]
+
+        return is_final[current_states].tolist()
@@ -1,6 +1,6 @@
 import uuid
 import pprint
-from typing import List, Dict, Set, Union, Tuple
+from typing import List, Dict, Set, Union, Tuple, Callable, Optional
 
 from schemas import Symbols
 
@@ -33,7 +33,7 @@ class Fa:
             "transactions": self.transactions
         })
 
-    def draw(self, directory: str, title: str = '') -> List[str]:
+    def draw(self, directory: str, title: str = '', on_image: Optional[Callable[[str], None]] = None) -> List[str]:
         title = title or self.FA_TYPE
 
         images: List[str] = []
@@ -99,11 +99,44 @@ class Fa:
                 graph.attr(label=label, fontsize='30')
                 image = graph.render(filename=label, directory=directory)
                 images.append(image)
+                if on_image:
+                    on_image(image)
                 step += 1
             state_stack = new_state_stack
 
         return images
 
+    def get_destination_states(self, state: str) -> Dict[str, Set[str]]:
+        return {
+            alphabet: alphabet_transactions if self.FA_TYPE == Symbols.NFA_TYPE else {alphabet_transactions}
+            for alphabet, alphabet_transactions in self.transactions.get(state, {}).items()
+        }
+
+    def get_useful_states(self) -> Set[str]:
+        reachable_states: Set[str] = {self.initial_state}
+        reverse_transactions: Dict[str, Set[str]] = dict()
+        stack: List[str] = [self.initial_state]
+        while stack:
+            state = stack.pop()
+            for alphabet_transactions in self.get_destination_states(state=state).values():
+                for destination_state in alphabet_transactions:
+                    reverse_transactions.setdefault(destination_state, set()).add(state)
+                    if destination_state not in reachable_states:
+                        reachable_states.add(destination_state)
+                        stack.append(destination_state)
+
+        co_reachable_states: Set[str] = self.final_states & reachable_states
+        stack = list(co_reachable_states)
+        while stack:
+            state = stack.pop()
+            for source_state in reverse_transactions.get(state, set()):
+                if source_state not in co_reachable_states:
+                    co_reachable_states.add(source_state)
+                    stack.append(source_state)
+
+        # the initial state is kept even if the language is empty
+        return co_reachable_states | {self.initial_state}
+
     @staticmethod
     def get_state_name(state: Union[str, Tuple[str, ...]]) -> str:
         return state if isinstance(state, str) else ",".join(state)
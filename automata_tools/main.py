@@ -1,5 +1,8 @@
 import tkinter
-from typing import Any, List
+from typing import Any, List, Optional, Tuple
+from collections import OrderedDict
+import multiprocessing
+import queue
 import tempfile
 
 from PIL import ImageTk, Image
@@ -8,6 +11,14 @@ from nfa import Nfa
 from dfa import Dfa
 
 ROOT_WINDOW_SIZE = "1280x720"
+IMAGE_CACHE_SIZE = 3
+POLL_INTERVAL_MS = 100
+
+MESSAGE_IMAGE = 'image'
+MESSAGE_TRIM = 'trim'
+MESSAGE_MERGE = 'merge'
+MESSAGE_DONE = 'done'
+MESSAGE_ERROR = 'error'
 
 
 def init_window() -> tkinter.Tk:
@@ -36,36 +47,151 @@ def regex_input(root_window: tkinter.Tk) -> str:
     return regex_input_var.get()
 
 
-def image_viewer(root_window: tkinter.Tk, images: List[str]) -> None:
-    images = [ImageTk.PhotoImage(Image.open(img)) for img in images]
+def compile_regex(regex: str, directory: str, messages: 'multiprocessing.Queue[Tuple[str, str]]') -> None:
+    def on_image(image: str) -> None:
+        messages.put((MESSAGE_IMAGE, image))
 
+    try:
+        nfa = Nfa.regex_to_nfa(regex=regex)
+        nfa.normalize()
+        nfa.draw(directory=directory, on_image=on_image)
+
+        messages.put((MESSAGE_MERGE, f"epsilon: {nfa.remove_epsilon()}"))
+        messages.put((MESSAGE_TRIM, f"nfa: {nfa.trim()}"))
+        dfa = Dfa.nfa_to_dfa(nfa=nfa)
+        messages.put((MESSAGE_TRIM, f"dfa: {dfa.trim()}"))
+        dfa.draw(directory=directory, on_image=on_image)
+
+        min_dfa = Dfa.minimize_dfa(dfa=dfa)
+        min_dfa.draw(directory=directory, title="min_dfa", on_image=on_image)
+    except Exception as e:
+        messages.put((MESSAGE_ERROR, repr(e)))
+    else:
+        messages.put((MESSAGE_DONE, ''))
+
+
+class ImageCache:
+    def __init__(self, size: int = IMAGE_CACHE_SIZE) -> None:
+        self.size = size
+        self.images: 'OrderedDict[str, ImageTk.PhotoImage]' = OrderedDict()
+
+    def get(self, path: str) -> ImageTk.PhotoImage:
+        image = self.images.get(path)
+        if image is not None:
+            self.images.move_to_end(path)
+            return image
+
+        with Image.open(path) as img:
+            image = ImageTk.PhotoImage(img)
+        self.images[path] = image
+        while len(self.images) > self.size:
+            self.images.popitem(last=False)
+        return image
+
+
+def image_viewer(root_window: tkinter.Tk, regex: str, directory: str) -> None:
+    images: List[str] = []
+    trimmed_states: List[str] = []
+    image_cache = ImageCache()
     image_index = 0
 
+    messages: 'multiprocessing.Queue[Tuple[str, str]]' = multiprocessing.Queue()
+    worker: Optional[multiprocessing.Process] = multiprocessing.Process(
+        target=compile_regex, args=(regex, directory, messages), daemon=True)
+    worker.start()
+
+    def show() -> None:
+        image_label.config(image=image_cache.get(images[image_index]), text='')
+
     def _next() -> None:
         nonlocal image_index
-        image_index = image_index + 1
-        try:
-            image_label.config(image=images[image_index])
-        except Exception:
-            image_index = -1
-            _next()
+        if images:
+            image_index = (image_index + 1) % len(images)
+            show()
 
     def back() -> None:
         nonlocal image_index
-        image_index = image_index - 1
-        try:
-            image_label.config(image=images[image_index])
-        except Exception:
-            image_index = 0
-            back()
+        if images:
+            image_index = (image_index - 1) % len(images)
+            show()
+
+    def stop_worker(status: str) -> None:
+        nonlocal worker
+        if worker is not None:
+            if worker.is_alive():
+                worker.terminate()
+            worker.join()
+            worker = None
+            messages.close()
+        cancel_btn.config(state=tkinter.DISABLED)
+        status_label.config(text=status)
+
+    def cancel() -> None:
+        stop_worker(status=f"Cancelled after {len(images)} steps")
+
+    def drain() -> bool:
+        while True:
+            try:
+                kind, payload = messages.get_nowait()
+            except queue.Empty:
+                return False
+
+            if kind == MESSAGE_IMAGE:
+                images.append(payload)
+                if len(images) == 1:
+                    show()
+                status_label.config(text=f"Compiling... {len(images)} steps")
+            elif kind == MESSAGE_TRIM:
+                trimmed_states.append(payload)
+                trim_label.config(text=f"Removed states ({', '.join(trimmed_states)})")
+            elif kind == MESSAGE_MERGE:
+                merge_label.config(text=f"Merged states ({payload})")
+            elif kind == MESSAGE_DONE:
+                stop_worker(status=f"Done, {len(images)} steps")
+                return True
+            elif kind == MESSAGE_ERROR:
+                stop_worker(status=f"Failed: {payload}")
+                return True
+
+    def poll() -> None:
+        if worker is None or drain():
+            return
+
+        if not worker.is_alive():
+            # the worker may have flushed its last messages after the queue was drained
+            if drain():
+                return
+            if worker.exitcode:
+                stop_worker(status=f"Worker exited with code {worker.exitcode}")
+            else:
+                stop_worker(status=f"Done, {len(images)} steps")
+            return
+
+        root_window.after(POLL_INTERVAL_MS, poll)
+
+    def close() -> None:
+        stop_worker(status='')
+        root_window.destroy()
+
+    status_label = tkinter.Label(root_window, text="Compiling...")
+    status_label.pack(side=tkinter.TOP)
+    trim_label = tkinter.Label(root_window)
+    trim_label.pack(side=tkinter.TOP)
+    merge_label = tkinter.Label(root_window)
+    merge_label.pack(side=tkinter.TOP)
+    cancel_btn = tkinter.Button(root_window, text='Cancel', command=cancel)
+    cancel_btn.pack(side=tkinter.TOP)
 
     tkinter.Button(root_window, text='Back', command=back).pack(side=tkinter.LEFT)
     tkinter.Button(root_window, text='Next', command=_next).pack(side=tkinter.RIGHT)
 
-    image_label = tkinter.Label(root_window, image=images[image_index])
+    image_label = tkinter.Label(root_window)
 
     image_label.pack(pady=150)
 
+    root_window.protocol("WM_DELETE_WINDOW", close)
+    root_window.after(POLL_INTERVAL_MS, poll)
+
 
 if __name__ == '__main__':
     root_window: tkinter.Tk = init_window()
@@ -73,17 +199,6 @@ if __name__ == '__main__':
     regex = regex_input(root_window=root_window)
 
     with tempfile.TemporaryDirectory() as temp_directory:
-        nfa = Nfa.regex_to_nfa(regex=regex)
-        nfa.normalize()
-        nfa_images = nfa.draw(directory=temp_directory)
-
-        dfa = Dfa.nfa_to_dfa(nfa=nfa)
-        dfa_images = dfa.draw(directory=temp_directory)
-
-        min_dfa = Dfa.minimize_dfa(dfa=dfa)
-        min_dfa_images = min_dfa.draw(directory=temp_directory, title="min_dfa")
-
-        images = nfa_images + dfa_images + min_dfa_images
-        image_viewer(root_window=root_window, images=images)
+        image_viewer(root_window=root_window, regex=regex, directory=temp_directory)
 
-    root_window.mainloop()
+        root_window.mainloop()
@@ -1,5 +1,5 @@
 import uuid
-from typing import List, Dict, Set, Optional
+from typing import List, Dict, Set, Optional, Tuple, Iterator
 
 from schemas import Symbols
 from utils import merge_dict
@@ -52,7 +52,7 @@ class Nfa(Fa):
             new_states.add(new_state)
             if state == self.initial_state:
                 new_initial_state = new_state
-            elif state in self.final_states:
+            if state in self.final_states:
                 new_final_states.add(new_state)
 
             if new_state_transactions:
@@ -63,6 +63,25 @@ class Nfa(Fa):
         self.final_states = new_final_states
         self.transactions = new_transactions
 
+    def trim(self) -> int:
+        useful_states: Set[str] = self.get_useful_states()
+
+        new_transactions: Dict[str, Dict[str, Set[str]]] = {}
+        for state in useful_states:
+            new_state_transactions: Dict[str, Set[str]] = {}
+            for alphabet, alphabet_transactions in self.transactions.get(state, {}).items():
+                new_alphabet_transactions = alphabet_transactions & useful_states
+                if new_alphabet_transactions:
+                    new_state_transactions[alphabet] = new_alphabet_transactions
+            if new_state_transactions:
+                new_transactions[state] = new_state_transactions
+
+        removed_states_count = len(self.states - useful_states)
+        self.states = self.states & useful_states
+        self.final_states = self.final_states & useful_states
+        self.transactions = new_transactions
+        return removed_states_count
+
     def kleene_star(self) -> None:
         if len(self.final_states) > 1:
             new_final_state = str(uuid.uuid4())
@@ -321,3 +340,121 @@ class Nfa(Fa):
                         stack.append(state)
 
         return result
+
+    def get_epsilon_components(self) -> Tuple[List[List[str]], Dict[str, int], List[int]]:
+        all_states: Set[str] = self.states | {self.initial_state} | set(self.transactions.keys())
+        for state_transactions in self.transactions.values():
+            for alphabet_transactions in state_transactions.values():
+                all_states |= alphabet_transactions
+
+        def epsilon_transactions(state: str) -> Set[str]:
+            return self.transactions.get(state, {}).get(Symbols.EPSILON, set())
+
+        # tarjan's algorithm over epsilon edges, components come out in reverse topological order
+        components: List[List[str]] = []
+        component_of: Dict[str, int] = {}
+        indices: Dict[str, int] = {}
+        lowlinks: Dict[str, int] = {}
+        stack: List[str] = []
+        on_stack: Set[str] = set()
+        for root_state in all_states:
+            if root_state in indices:
+                continue
+
+            indices[root_state] = lowlinks[root_state] = len(indices)
+            stack.append(root_state)
+            on_stack.add(root_state)
+            work: List[Tuple[str, Iterator[str]]] = [(root_state, iter(epsilon_transactions(root_state)))]
+            while work:
+                state, destination_states = work[-1]
+                for destination_state in destination_states:
+                    if destination_state not in indices:
+                        indices[destination_state] = lowlinks[destination_state] = len(indices)
+                        stack.append(destination_state)
+                        on_stack.add(destination_state)
+                        work.append((destination_state, iter(epsilon_transactions(destination_state))))
+                        break
+                    if destination_state in on_stack:
+                        lowlinks[state] = min(lowlinks[state], indices[destination_state])
+                else:
+                    work.pop()
+                    if work:
+                        parent_state = work[-1][0]
+                        lowlinks[parent_state] = min(lowlinks[parent_state], lowlinks[state])
+                    if lowlinks[state] == indices[state]:
+                        component: List[str] = []
+                        while True:
+                            component_state = stack.pop()
+                            on_stack.remove(component_state)
+                            component_of[component_state] = len(components)
+                            component.append(component_state)
+                            if component_state == state:
+                                break
+                        components.append(component)
+
+        # every component is a bit, successors are always closed before their predecessors
+        closures: List[int] = []
+        for index, component in enumerate(components):
+            closure = 1 << index
+            for state in component:
+                for destination_state in epsilon_transactions(state):
+                    destination_component = component_of[destination_state]
+                    if destination_component != index:
+                        closure |= closures[destination_component]
+            closures.append(closure)
+
+        return components, component_of, closures
+
+    def get_epsilon_closures(self) -> Dict[str, Set[str]]:
+        components, component_of, closures = self.get_epsilon_components()
+
+        component_closures: List[Set[str]] = []
+        for closure in closures:
+            closure_states: Set[str] = set()
+            for index in self.iterate_bits(closure):
+                closure_states.update(components[index])
+            component_closures.append(closure_states)
+
+        return {state: component_closures[component] for state, component in component_of.items()}
+
+    def remove_epsilon(self) -> int:
+        components, component_of, closures = self.get_epsilon_components()
+        component_names: List[str] = [
+            self.initial_state if self.initial_state in component else component[0] for component in components]
+
+        final_components: int = 0
+        for state in self.final_states:
+            if state in component_of:
+                final_components |= 1 << component_of[state]
+
+        new_final_states: Set[str] = set()
+        new_transactions: Dict[str, Dict[str, Set[str]]] = {}
+        for index, closure in enumerate(closures):
+            new_state_transactions: Dict[str, Set[str]] = {}
+            for closure_component in self.iterate_bits(closure):
+                for state in components[closure_component]:
+                    for alphabet, alphabet_transactions in self.transactions.get(state, {}).items():
+                        if alphabet == Symbols.EPSILON:
+                            continue
+                        new_alphabet_transactions = new_state_transactions.setdefault(alphabet, set())
+                        for destination_state in alphabet_transactions:
+                            new_alphabet_transactions.add(component_names[component_of[destination_state]])
+
+            if new_state_transactions:
+                new_transactions[component_names[index]] = new_state_transactions
+            if closure & final_components:
+                new_final_states.add(component_names[index])
+
+        merged_states_count = len(component_of) - len(components)
+        self.states = set(component_names)
+        self.initial_state = component_names[component_of[self.initial_state]]
+        self.final_states = new_final_states
+        self.transactions = new_transactions
+        return merged_states_count
+
+    @staticmethod
+    def iterate_bits(bits: int) -> Iterator[int]:
+        while bits:
+            lowest_bit = bits & -bits
+            yield lowest_bit.bit_length() - 1
+            bits ^= lowest_bit
@@ -0,0 +1,218 @@
+import uuid
+import asyncio
+import functools
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Dict, List, Tuple, Optional, Hashable, Sequence, Set
+
+import numpy
+
+from nfa import Nfa
+from dfa import Dfa
+
+BATCH_WINDOW = 0.002
+MAX_BATCH_SIZE = 1024
+MAX_PENDING_REQUESTS = 10000
+
+
+class ServiceOverloaded(Exception):
+    pass
+
+
+class ServiceClosed(Exception):
+    pass
+
+
+class PatternNotFound(KeyError):
+    pass
+
+
+class InvalidPattern(ValueError):
+    pass
+
+
+class CompiledPattern:
+    def __init__(
+        self,
+        pattern_id: str,
+        regex: str,
+        dfa: Dfa,
+        removed_states_count: int = 0,
+        merged_states_count: int = 0
+    ) -> None:
+        self.pattern_id = pattern_id
+        self.regex = regex
+        self.dfa = dfa
+        self.removed_states_count = removed_states_count
+        self.merged_states_count = merged_states_count
+        self.transition_table: Tuple[numpy.ndarray, Dict[Hashable, int], Dict[str, int],
+                                     numpy.ndarray] = dfa.transition_table
+
+    @classmethod
+    def compile(cls, pattern_id: str, regex: str) -> 'CompiledPattern':
+        try:
+            nfa = Nfa.regex_to_nfa(regex=regex)
+            merged_states_count = nfa.remove_epsilon()
+            removed_states_count = nfa.trim()
+            nfa.normalize()
+            dfa = Dfa.nfa_to_dfa(nfa=nfa)
+            removed_states_count += dfa.trim()
+            min_dfa = Dfa.minimize_dfa(dfa=dfa)
+        except Exception as e:
+            raise InvalidPattern(f"{regex!r}: {e!r}") from e
+        return cls(pattern_id=pattern_id, regex=regex, dfa=min_dfa, removed_states_count=removed_states_count,
+                   merged_states_count=merged_states_count)
+
+    def match_batch(self, words: Sequence[str]) -> List[bool]:
+        return Dfa.match_batch_with_table(self.transition_table, words=words)
+
+
+class MatchService:
+    def __init__(
+        self,
+        executor: Optional[Executor] = None,
+        compile_executor: Optional[Executor] = None,
+        batch_window: float = BATCH_WINDOW,
+        max_batch_size: int = MAX_BATCH_SIZE,
+        max_pending_requests: int = MAX_PENDING_REQUESTS
+    ) -> None:
+        self.owns_executor = executor is None
+        self.executor = executor or ThreadPoolExecutor()
+        # compiling is pure python and holds the gil, so a process pool keeps it from competing with
+        # the event loop and the batches; by default it shares the thread pool of the batches
+        self.compile_executor = compile_executor or self.executor
+        self.closed = False
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+        self.max_pending_requests = max_pending_requests
+
+        self.patterns: Dict[str, CompiledPattern] = {}
+        self.patterns_by_regex: Dict[str, str] = {}
+        self.compiling: Dict[str, 'asyncio.Future[CompiledPattern]'] = {}
+
+        self.pending_requests: int = 0
+        self.batches: Dict[str, List[Tuple[str, 'asyncio.Future[bool]']]] = {}
+        self.batch_timers: Dict[str, asyncio.TimerHandle] = {}
+        self.batch_tasks: Set['asyncio.Task[None]'] = set()
+
+    async def compile(self, regex: str) -> str:
+        self.check_closed()
+        pattern_id = self.patterns_by_regex.get(regex)
+        if pattern_id:
+            return pattern_id
+
+        # concurrent compiles of the same regex share one executor job, which is shielded so that
+        # a cancelled caller does not cancel it for the others
+        future = self.compiling.get(regex)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = asyncio.ensure_future(loop.run_in_executor(
+                self.compile_executor, CompiledPattern.compile, str(uuid.uuid4()), regex))
+            self.compiling[regex] = future
+            future.add_done_callback(functools.partial(self.compile_done, regex))
+        pattern = await asyncio.shield(future)
+        return pattern.pattern_id
+
+    def compile_done(self, regex: str, future: 'asyncio.Future[CompiledPattern]') -> None:
+        del self.compiling[regex]
+        if future.cancelled() or future.exception() is not None:
+            return
+        pattern = future.result()
+        self.patterns[pattern.pattern_id] = pattern
+        self.patterns_by_regex[regex] = pattern.pattern_id
+
+    def check_closed(self) -> None:
+        if self.closed:
+            raise ServiceClosed()
+
+    def get_pattern(self, pattern_id: str) -> CompiledPattern:
+        pattern = self.patterns.get(pattern_id)
+        if pattern is None:
+            raise PatternNotFound(pattern_id)
+        return pattern
+
+    def remove_pattern(self, pattern_id: str) -> None:
+        pattern = self.patterns.pop(pattern_id, None)
+        if pattern is not None:
+            self.patterns_by_regex.pop(pattern.regex, None)
+
+    async def match(self, pattern_id: str, word: str, timeout: Optional[float] = None) -> bool:
+        self.check_closed()
+        self.get_pattern(pattern_id=pattern_id)
+        if self.pending_requests >= self.max_pending_requests:
+            raise ServiceOverloaded(f"{self.pending_requests} requests are pending")
+
+        loop = asyncio.get_running_loop()
+        future: 'asyncio.Future[bool]' = loop.create_future()
+        batch = self.batches.setdefault(pattern_id, [])
+        batch.append((word, future))
+        self.pending_requests += 1
+        future.add_done_callback(self.request_done)
+
+        if len(batch) >= self.max_batch_size:
+            self.flush(pattern_id=pattern_id)
+        elif pattern_id not in self.batch_timers:
+            self.batch_timers[pattern_id] = loop.call_later(self.batch_window, self.flush, pattern_id)
+
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout=timeout)
+        finally:
+            # a request that missed its deadline is skipped when its batch runs
+            future.cancel()
+
+    def flush(self, pattern_id: str) -> Optional['asyncio.Task[None]']:
+        timer = self.batch_timers.pop(pattern_id, None)
+        if timer is not None:
+            timer.cancel()
+
+        batch = self.batches.pop(pattern_id, [])
+        batch = [(word, future) for word, future in batch if not future.done()]
+        if not batch:
+            return None
+
+        task = asyncio.ensure_future(self.run_batch(pattern_id=pattern_id, batch=batch))
+        self.batch_tasks.add(task)
+        task.add_done_callback(self.batch_tasks.discard)
+        return task
+
+    def request_done(self, future: 'asyncio.Future[bool]') -> None:
+        self.pending_requests -= 1
+
+    async def run_batch(self, pattern_id: str, batch: List[Tuple[str, 'asyncio.Future[bool]']]) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            pattern = self.get_pattern(pattern_id=pattern_id)
+            results = await loop.run_in_executor(
+                self.executor, pattern.match_batch, [word for word, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def close(self) -> None:
+        self.closed = True
+        for pattern_id in list(self.batches.keys()):
+            self.flush(pattern_id=pattern_id)
+        await asyncio.gather(*self.batch_tasks)
+        if self.owns_executor:
+            self.executor.shutdown(wait=False)
+
+
+class LocalClient:
+    def __init__(self, service: MatchService) -> None:
+        self.service = service
+
+    async def compile(self, regex: str) -> str:
+        return await self.service.compile(regex=regex)
+
+    async def match(self, pattern_id: str, word: str, timeout: Optional[float] = None) -> bool:
+        return await self.service.match(pattern_id=pattern_id, word=word, timeout=timeout)
+
+    async def match_many(self, pattern_id: str, words: Sequence[str],
+                         timeout: Optional[float] = None) -> List[bool]:
+        return list(await asyncio.gather(*[
+            self.match(pattern_id=pattern_id, word=word, timeout=timeout) for word in words]))
@@ -0,0 +1,89 @@
+import re
+import random
+from typing import List
+
+from schemas import Symbols
+from nfa import Nfa
+from dfa import Dfa
+
+REGEXES = ['ab', 'a*', 'a+b?c*', '(a|b)*abb', 'a(b|c)*d?', '(ab)+|c', '((a*)*b)*', '(a?b?)*c']
+
+
+def random_words(count: int) -> List[str]:
+    generator = random.Random(0)
+    return [''.join(generator.choice('abcd') for _ in range(generator.randint(0, 8))) for _ in range(count)]
+
+
+def build_nfa() -> Nfa:
+    # i -$-> x -$-> y -$-> x is an epsilon cycle, y -a-> f
+    return Nfa(
+        states={'i', 'x', 'y', 'f'},
+        initial_state='i',
+        final_states={'f'},
+        transactions={
+            'i': {Symbols.EPSILON: {'x'}},
+            'x': {Symbols.EPSILON: {'y'}},
+            'y': {Symbols.EPSILON: {'x'}, 'a': {'f'}},
+            'f': {Symbols.EPSILON: {'i'}},
+        },
+        alphabets={'a', Symbols.EPSILON}
+    )
+
+
+def has_epsilon(nfa: Nfa) -> bool:
+    return any(Symbols.EPSILON in state_transactions for state_transactions in nfa.transactions.values())
+
+
+def test_epsilon_closures_match_get_epsilon_closure() -> None:
+    nfa = build_nfa()
+    closures = nfa.get_epsilon_closures()
+    assert closures['f'] == {'f', 'i', 'x', 'y'}
+    assert closures['x'] == {'x', 'y'}
+
+    for regex in REGEXES:
+        nfa = Nfa.regex_to_nfa(regex=regex)
+        closures = nfa.get_epsilon_closures()
+        for state in nfa.states:
+            assert closures[state] == Nfa.get_epsilon_closure(nfa=nfa, state=state)
+
+
+def test_remove_epsilon_merges_epsilon_cycle() -> None:
+    nfa = build_nfa()
+    assert nfa.remove_epsilon() == 1
+    assert not has_epsilon(nfa)
+    assert len(nfa.states) == 3
+    assert nfa.initial_state == 'i'
+
+    dfa = Dfa.nfa_to_dfa(nfa=nfa)
+    assert [dfa.match(word) for word in ['', 'a', 'aa', 'b']] == [False, True, True, False]
+
+
+def test_initial_state_becomes_final() -> None:
+    nfa = Nfa.regex_to_nfa(regex='a*')
+    assert nfa.initial_state not in nfa.final_states
+
+    nfa.remove_epsilon()
+    assert nfa.initial_state in nfa.final_states
+
+    nfa.normalize()
+    assert nfa.initial_state in nfa.final_states
+    dfa = Dfa.nfa_to_dfa(nfa=nfa)
+    assert dfa.match('') and dfa.match('aaa') and not dfa.match('b')
+
+
+def test_remove_epsilon_keeps_language() -> None:
+    words = random_words(count=300)
+    for regex in REGEXES:
+        nfa = Nfa.regex_to_nfa(regex=regex)
+        nfa.normalize()
+        dfa = Dfa.nfa_to_dfa(nfa=nfa)
+        expected = [dfa.match(word) for word in words]
+        assert expected == [re.fullmatch(regex, word) is not None for word in words]
+
+        epsilon_free_nfa = Nfa.regex_to_nfa(regex=regex)
+        epsilon_free_nfa.remove_epsilon()
+        assert not has_epsilon(epsilon_free_nfa)
+        epsilon_free_nfa.trim()
+        epsilon_free_nfa.normalize()
+        epsilon_free_dfa = Dfa.nfa_to_dfa(nfa=epsilon_free_nfa)
+        assert [epsilon_free_dfa.match(word) for word in words] == expected
@@ -0,0 +1,166 @@
+import re
+import asyncio
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Sequence
+
+import pytest
+
+from service import MatchService, LocalClient, ServiceOverloaded, ServiceClosed, InvalidPattern
+
+REGEXES = ['(a|b)*abb', 'a+b?c*', 'ab|cd*', 'a(b|c)*d?']
+
+
+def random_words(count: int) -> List[str]:
+    generator = random.Random(0)
+    return [''.join(generator.choice('abcdx') for _ in range(generator.randint(0, 8))) for _ in range(count)]
+
+
+@pytest.mark.parametrize('regex', REGEXES)
+def test_match_batch_agrees_with_re(regex: str) -> None:
+    async def run() -> None:
+        service = MatchService()
+        client = LocalClient(service=service)
+        pattern_id = await client.compile(regex=regex)
+
+        words = random_words(count=500)
+        assert await client.match_many(pattern_id=pattern_id, words=words) == [
+            re.fullmatch(regex, word) is not None for word in words]
+        await service.close()
+
+    asyncio.run(run())
+
+
+def test_overloaded() -> None:
+    async def run() -> None:
+        service = MatchService(batch_window=10, max_pending_requests=2)
+        client = LocalClient(service=service)
+        pattern_id = await client.compile(regex='ab')
+
+        requests = [asyncio.ensure_future(client.match(pattern_id=pattern_id, word='ab')) for _ in range(2)]
+        await asyncio.sleep(0)
+        with pytest.raises(ServiceOverloaded):
+            await client.match(pattern_id=pattern_id, word='ab')
+
+        await service.close()
+        assert await asyncio.gather(*requests) == [True, True]
+
+    asyncio.run(run())
+
+
+def test_expired_request_is_skipped() -> None:
+    async def run() -> None:
+        service = MatchService(batch_window=0.05)
+        client = LocalClient(service=service)
+        pattern_id = await client.compile(regex='ab')
+        pattern = service.get_pattern(pattern_id=pattern_id)
+
+        batches: List[List[str]] = []
+        match_batch = pattern.match_batch
+
+        def recording_match_batch(words: Sequence[str]) -> List[bool]:
+            batches.append(list(words))
+            return match_batch(words)
+
+        pattern.match_batch = recording_match_batch  # type: ignore
+
+        request = asyncio.ensure_future(client.match(pattern_id=pattern_id, word='ab'))
+        with pytest.raises(asyncio.TimeoutError):
+            await client.match(pattern_id=pattern_id, word='expired', timeout=0.001)
+
+        assert await request is True
+        assert batches == [['ab']]
+        assert service.pending_requests == 0
+        await service.close()
+
+    asyncio.run(run())
+
+
+def test_compile_is_deduplicated() -> None:
+    async def run() -> None:
+        service = MatchService()
+        client = LocalClient(service=service)
+
+        pattern_ids = await asyncio.gather(*[client.compile(regex='(a|b)*abb') for _ in range(5)])
+        assert len(set(pattern_ids)) == 1
+        assert list(service.patterns.keys()) == [pattern_ids[0]]
+        assert await client.compile(regex='(a|b)*abb') == pattern_ids[0]
+        await service.close()
+
+    asyncio.run(run())
+
+
+def test_cancelled_compile_does_not_cancel_others() -> None:
+    async def run() -> None:
+        service = MatchService()
+        client = LocalClient(service=service)
+
+        first = asyncio.ensure_future(client.compile(regex='(a|b)*abb'))
+        second = asyncio.ensure_future(client.compile(regex='(a|b)*abb'))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        pattern_id = await second
+        assert service.get_pattern(pattern_id=pattern_id).regex == '(a|b)*abb'
+        await service.close()
+
+    asyncio.run(run())
+
+
+def test_close_resolves_pending_requests() -> None:
+    async def run() -> None:
+        service = MatchService(batch_window=10)
+        client = LocalClient(service=service)
+        pattern_id = await client.compile(regex='a+b?c*')
+
+        words = ['a', 'abc', 'b', 'aacc']
+        requests = [asyncio.ensure_future(client.match(pattern_id=pattern_id, word=word)) for word in words]
+        await asyncio.sleep(0)
+        await service.close()
+
+        assert await asyncio.gather(*requests) == [True, True, False, True]
+
+    asyncio.run(run())
+
+
+def test_invalid_pattern() -> None:
+    async def run() -> None:
+        service = MatchService()
+        client = LocalClient(service=service)
+
+        with pytest.raises(InvalidPattern):
+            await client.compile(regex='(a|b)c')
+        assert not service.patterns
+        await service.close()
+
+    asyncio.run(run())
+
+
+def test_compile_in_process_pool() -> None:
+    async def run() -> None:
+        with ProcessPoolExecutor(max_workers=1) as compile_executor:
+            service = MatchService(compile_executor=compile_executor)
+            client = LocalClient(service=service)
+
+            pattern_id = await client.compile(regex='(a|b)*abb')
+            assert await client.match_many(pattern_id=pattern_id, words=['abb', 'ab', 'babb']) == [True, False, True]
+            with pytest.raises(InvalidPattern):
+                await client.compile(regex='(a|b)c')
+            await service.close()
+
+    asyncio.run(run())
+
+
+def test_closed_service_rejects_calls() -> None:
+    async def run() -> None:
+        service = MatchService()
+        client = LocalClient(service=service)
+        pattern_id = await client.compile(regex='ab')
+        await service.close()
+
+        with pytest.raises(ServiceClosed):
+            await client.match(pattern_id=pattern_id, word='ab')
+        with pytest.raises(ServiceClosed):
+            await client.compile(regex='a*')
+
+    asyncio.run(run())
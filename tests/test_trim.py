@@ -0,0 +1,115 @@
+import random
+from typing import List
+
+from schemas import Symbols
+from nfa import Nfa
+from dfa import Dfa
+
+REGEXES = ['ab', 'a+b?c*', '(a|b)*abb', 'a(b|c)*d?', '(ab)+|c']
+
+
+def random_words(count: int) -> List[str]:
+    generator = random.Random(0)
+    return [''.join(generator.choice('abcd') for _ in range(generator.randint(0, 8))) for _ in range(count)]
+
+
+def build_nfa() -> Nfa:
+    # i -a-> m -b-> f, i -b-> d is dead and u -a-> f is unreachable
+    return Nfa(
+        states={'i', 'm', 'f', 'd', 'u'},
+        initial_state='i',
+        final_states={'f'},
+        transactions={
+            'i': {'a': {'m'}, 'b': {'d'}},
+            'm': {'b': {'f'}, Symbols.EPSILON: {'d'}},
+            'd': {'a': {'d'}},
+            'u': {'a': {'f'}},
+        },
+        alphabets={'a', 'b', Symbols.EPSILON}
+    )
+
+
+def is_complete(dfa: Dfa) -> bool:
+    return all(set(dfa.transactions[state].keys()) == dfa.alphabets and
+               set(dfa.transactions[state].values()) <= dfa.states for state in dfa.states)
+
+
+def test_nfa_trim_removes_unreachable_and_dead_states() -> None:
+    nfa = build_nfa()
+    assert nfa.get_useful_states() == {'i', 'm', 'f'}
+
+    assert nfa.trim() == 2
+    assert nfa.states == {'i', 'm', 'f'}
+    assert nfa.final_states == {'f'}
+    assert nfa.transactions == {'i': {'a': {'m'}}, 'm': {'b': {'f'}}}
+
+
+def test_trim_keeps_initial_state_of_empty_language() -> None:
+    nfa = build_nfa()
+    nfa.final_states = set()
+    assert nfa.trim() == 4
+    assert nfa.states == {'i'}
+    assert nfa.transactions == {}
+
+    dfa = Dfa(
+        states={'A', 'B'},
+        initial_state='A',
+        final_states=set(),
+        transactions={'A': {'a': 'B'}, 'B': {'a': 'A'}},
+        alphabets={'a'}
+    )
+    assert dfa.trim() == 1
+    assert dfa.states == {'A', Symbols.TRAP_STATE}
+    assert dfa.initial_state == 'A'
+    assert not dfa.match('') and not dfa.match('aa')
+
+
+def test_dfa_trim_merges_dead_states_into_trap_state() -> None:
+    dfa = Dfa(
+        states={'A', 'B', 'C', 'D', Symbols.TRAP_STATE},
+        initial_state='A',
+        final_states={'B'},
+        transactions={
+            'A': {'a': 'B', 'b': 'C'},
+            'B': {'a': 'B', 'b': 'D'},
+            'C': {'a': 'D', 'b': 'C'},
+            'D': {'a': 'C', 'b': Symbols.TRAP_STATE},
+            Symbols.TRAP_STATE: {'a': Symbols.TRAP_STATE, 'b': Symbols.TRAP_STATE},
+        },
+        alphabets={'a', 'b'}
+    )
+    assert dfa.trim() == 2
+    assert dfa.states == {'A', 'B', Symbols.TRAP_STATE}
+    assert is_complete(dfa)
+
+    min_dfa = Dfa.minimize_dfa(dfa=dfa)
+    assert is_complete(min_dfa)
+    assert [min_dfa.match(word) for word in ['a', 'aa', 'b', 'ab', 'ba']] == [True, True, False, False, False]
+
+
+def test_dfa_trim_counts_net_reduction() -> None:
+    nfa = Nfa.regex_to_nfa(regex='ab')
+    nfa.normalize()
+    dfa = Dfa.nfa_to_dfa(nfa=nfa)
+    states_count = len(dfa.states)
+    assert dfa.trim() == states_count - len(dfa.states)
+
+
+def test_trim_keeps_language() -> None:
+    words = random_words(count=300)
+    for regex in REGEXES:
+        nfa = Nfa.regex_to_nfa(regex=regex)
+        nfa.normalize()
+        dfa = Dfa.nfa_to_dfa(nfa=nfa)
+        expected = [dfa.match(word) for word in words]
+
+        trimmed_nfa = Nfa.regex_to_nfa(regex=regex)
+        trimmed_nfa.trim()
+        trimmed_nfa.normalize()
+        trimmed_dfa = Dfa.nfa_to_dfa(nfa=trimmed_nfa)
+        assert [trimmed_dfa.match(word) for word in words] == expected
+
+        trimmed_dfa.trim()
+        assert is_complete(trimmed_dfa)
+        min_dfa = Dfa.minimize_dfa(dfa=trimmed_dfa)
+        assert [min_dfa.match(word) for word in words] == expected